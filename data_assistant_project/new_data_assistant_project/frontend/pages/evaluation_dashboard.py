@@ -3,64 +3,51 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+import importlib
 import logging
 import sys
 from pathlib import Path
 
+# Logging is configured by the Streamlit entrypoint (frontend/app.py)
+logger = logging.getLogger(__name__)
+
+# Import locations tried in order: (models module, utils package, needs manual sys.path)
+IMPORT_ATTEMPTS = [
+    ('src.database.postgres_models', 'src.utils', False),
+    ('database.postgres_models', 'utils', False),
+    ('src.database.models', 'src.utils', False),
+    ('database.postgres_models', 'utils', True),
+    ('database.models', 'utils', True),
+]
+
 # Robust import function
 def robust_import_modules():
-    """Import required modules with multiple fallback strategies."""
-    
-    # Strategy 1: Try PostgreSQL imports first (Docker/production - new structure)
-    try:
-        from src.database.postgres_models import ExplanationFeedback, User, ChatSession, ComprehensiveFeedback
-        from src.utils.auth_manager import AuthManager
-        print("✅ Evaluation Dashboard: PostgreSQL imports successful")
-        return ExplanationFeedback, User, ChatSession, None, AuthManager
-    except ImportError as e:
-        print(f"❌ PostgreSQL imports failed: {e}")
-    
-    # Strategy 2: Try relative PostgreSQL imports (fallback)
-    try:
-        from database.postgres_models import ExplanationFeedback, User, ChatSession, ComprehensiveFeedback
-        from utils.auth_manager import AuthManager
-        print("✅ Evaluation Dashboard: Relative PostgreSQL imports successful")
-        return ExplanationFeedback, User, ChatSession, None, AuthManager
-    except ImportError as e:
-        print(f"❌ Relative PostgreSQL imports failed: {e}")
-    
-    # Strategy 3: Try direct imports (fallback to SQLite)
-    try:
-        from src.database.models import ExplanationFeedback, User, ChatSession
-        from src.utils.path_utils import get_absolute_path
-        from src.utils.auth_manager import AuthManager
-        print("✅ Evaluation Dashboard: SQLite fallback imports successful")
-        return ExplanationFeedback, User, ChatSession, get_absolute_path, AuthManager
-    except ImportError as e:
-        print(f"❌ SQLite fallback imports failed: {e}")
-    
-    # Strategy 4: Manual path manipulation
-    try:
-        current_dir = Path.cwd()
-        sys.path.insert(0, str(current_dir))
-        sys.path.insert(0, str(current_dir / 'src'))
-        
-        from database.postgres_models import ExplanationFeedback, User, ChatSession, ComprehensiveFeedback
-        from utils.auth_manager import AuthManager
-        print("✅ Evaluation Dashboard: Manual path PostgreSQL imports successful")
-        return ExplanationFeedback, User, ChatSession, None, AuthManager
-    except ImportError as e:
-        print(f"❌ Manual path PostgreSQL imports failed: {e}")
+    """Import required modules from the first location in IMPORT_ATTEMPTS that works."""
+    last_error = None
+    for models_path, utils_path, needs_path in IMPORT_ATTEMPTS:
+        if needs_path:
+            current_dir = Path.cwd()
+            for path in (current_dir, current_dir / 'src'):
+                if str(path) not in sys.path:
+                    sys.path.insert(0, str(path))
         try:
-            from database.models import ExplanationFeedback, User, ChatSession
-            from utils.path_utils import get_absolute_path
-            from utils.auth_manager import AuthManager
-            print("✅ Evaluation Dashboard: Manual path SQLite fallback successful")
-            return ExplanationFeedback, User, ChatSession, get_absolute_path, AuthManager
-        except ImportError as e2:
-            print(f"❌ Manual path SQLite fallback failed: {e2}")
-            st.error(f"❌ Could not import required modules: {e2}")
-            st.stop()
+            models = importlib.import_module(models_path)
+            auth_module = importlib.import_module(f'{utils_path}.auth_manager')
+            # PostgreSQL models don't need the SQLite path helper
+            get_absolute_path = None
+            if not models_path.endswith('postgres_models'):
+                get_absolute_path = importlib.import_module(f'{utils_path}.path_utils').get_absolute_path
+            result = (models.ExplanationFeedback, models.User, models.ChatSession,
+                      get_absolute_path, auth_module.AuthManager)
+        except (ImportError, AttributeError) as e:
+            last_error = e
+            continue
+        logger.info("Evaluation Dashboard: imports from %s successful", models_path)
+        return result
+
+    logger.error("Evaluation Dashboard: could not import required modules", exc_info=last_error)
+    st.error(f"❌ Could not import required modules: {last_error}")
+    st.stop()
 
 # Import modules
 ExplanationFeedback, User, ChatSession, get_absolute_path, AuthManager = robust_import_modules()
@@ -76,9 +63,51 @@ except ImportError:
 
 # ComprehensiveFeedback is now imported in robust_import_modules()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+# Low-cardinality text columns stored as categoricals and 1-5 ratings stored as int8
+CATEGORICAL_COLUMNS = ['Role', 'Gender', 'Education', 'Recommendation', 'Auto Explanation', 'System Accuracy']
+RATING_COLUMNS = ['Frequency Rating', 'Explanation Quality', 'System Helpfulness', 'Learning Improvement']
+
+def compact_dtypes(df):
+    """Cast repeated string columns to category and rating columns to int8."""
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col in RATING_COLUMNS:
+        if col in df.columns and df[col].notna().all():
+            df[col] = df[col].astype('int8')
+    return df
+
+# User fields shown in the "Recent User Activity" table, mapped to their display names
+USER_TABLE_COLUMNS = {
+    'username': 'Username',
+    'role': 'Role',
+    'age': 'Age',
+    'user_level_category': 'Assessment Level',
+    'gender': 'Gender',
+    'profession': 'Profession',
+    'education_level': 'Education',
+    'Created': 'Created',
+}
+
+def build_users_dataframe(users):
+    """Build a DataFrame with one row per user and a datetime64 created_at column."""
+    fields = [col for col in USER_TABLE_COLUMNS if col != 'Created'] + ['created_at']
+    users_df = pd.DataFrame([vars(user) for user in users], columns=fields, dtype=object)
+    users_df['created_at'] = pd.to_datetime(users_df['created_at'], errors='coerce')
+    return users_df
+
+@st.cache_data(ttl=300, show_spinner="Loading feedback…")
+def load_explanation_feedback(db_config):
+    """
+    Fetch explanation feedback as plain dicts so results pickle cleanly into the cache.
+    Errors are raised rather than returned as an empty list, so a failed load is not cached.
+    """
+    return tuple(vars(fb) for fb in ExplanationFeedback.get_all_feedback(db_config, raise_errors=True))
+
+@st.cache_data(ttl=300, show_spinner="Loading feedback…")
+def load_comprehensive_feedback(db_config):
+    """Fetch comprehensive research feedback as plain dicts for caching (errors raise, see load_explanation_feedback)."""
+    return tuple(vars(fb) for fb in ComprehensiveFeedback.get_all_feedback(db_config, raise_errors=True))
 
 def render_evaluation_dashboard():
     """Main function to render the evaluation dashboard."""
@@ -259,25 +288,12 @@ def render_user_analytics_tab():
             # Recent user table with real data
             st.subheader("📋 Recent User Activity")
             
-            # Prepare user data for display
-            user_display_data = []
-            for user in users[:10]:  # Show last 10 users
-                user_display_data.append({
-                    'Username': user.username,
-                    'Role': user.role,
-                    'Age': user.age or 'Not Specified',
-                    'Assessment Level': user.user_level_category or 'Not Assessed',
-                    'Gender': user.gender or 'Not Specified',
-                    'Profession': user.profession or 'Not Specified',
-                    'Education': user.education_level or 'Not Specified',
-                    'Created': user.created_at.strftime('%Y-%m-%d') if user.created_at else 'Unknown'
-                })
-            
-            if user_display_data:
-                user_df = pd.DataFrame(user_display_data)
-                st.dataframe(user_df, use_container_width=True)
-            else:
-                st.info("No user data available")
+            # Format the display columns vectorized over the users frame
+            users_df = build_users_dataframe(users)
+            users_df['Created'] = users_df['created_at'].dt.strftime('%Y-%m-%d').fillna('Unknown')
+            recent_users = users_df[list(USER_TABLE_COLUMNS)].head(10)  # Show last 10 users
+            recent_users = recent_users.fillna({'user_level_category': 'Not Assessed'}).fillna('Not Specified')
+            st.dataframe(compact_dtypes(recent_users.rename(columns=USER_TABLE_COLUMNS)), use_container_width=True)
                 
         else:
             st.info("No users found in the database")
@@ -298,6 +314,11 @@ def render_feedback_analysis_tab():
     """Render feedback analysis and sentiment trends."""
     st.subheader("💬 User Feedback Analysis")
     
+    # Feedback is cached for a few minutes; let admins force a reload
+    if st.button("🔄 Refresh Feedback"):
+        load_explanation_feedback.clear()
+        load_comprehensive_feedback.clear()
+    
     # Get database path
     try:
         auth_manager = AuthManager()
@@ -312,18 +333,22 @@ def render_feedback_analysis_tab():
     st.markdown("### 📝 Explanation Feedback Analysis")
     
     if ExplanationFeedback:
-        feedback_data = ExplanationFeedback.get_all_feedback(db_config)
+        try:
+            feedback_data = load_explanation_feedback(db_config)
+        except Exception as e:
+            st.error(f"Error loading explanation feedback: {e}")
+            feedback_data = None
         
         if feedback_data:
             # Convert to DataFrame for analysis
             feedback_df = pd.DataFrame([
                 {
-                    'Username': getattr(fb, 'username', 'Unknown'),
-                    'Explanation Given': fb.explanation_given,
-                    'Was Needed': fb.was_needed,
-                    'Was Helpful': fb.was_helpful,
-                    'Would Have Been Needed': fb.would_have_been_needed,
-                    'Date': fb.created_at.strftime('%Y-%m-%d %H:%M')
+                    'Username': fb.get('username', 'Unknown'),
+                    'Explanation Given': fb['explanation_given'],
+                    'Was Needed': fb['was_needed'],
+                    'Was Helpful': fb['was_helpful'],
+                    'Would Have Been Needed': fb['would_have_been_needed'],
+                    'Date': fb['created_at'].strftime('%Y-%m-%d %H:%M')
                 }
                 for fb in feedback_data
             ])
@@ -335,12 +360,12 @@ def render_feedback_analysis_tab():
             with col1:
                 st.metric("Total Feedback", len(feedback_data))
             with col2:
-                explanations_given = sum(1 for fb in feedback_data if fb.explanation_given)
+                explanations_given = sum(1 for fb in feedback_data if fb['explanation_given'])
                 st.metric("Explanations Given", explanations_given)
             with col3:
-                helpful_explanations = sum(1 for fb in feedback_data if fb.was_helpful)
+                helpful_explanations = sum(1 for fb in feedback_data if fb['was_helpful'])
                 st.metric("Helpful Explanations", helpful_explanations)
-        else:
+        elif feedback_data is not None:
             st.info("No explanation feedback data available yet.")
     else:
         st.warning("ExplanationFeedback model not available.")
@@ -349,24 +374,29 @@ def render_feedback_analysis_tab():
     st.markdown("### 🔬 Comprehensive Research Feedback Analysis")
     
     if ComprehensiveFeedback:
-        comprehensive_feedback_data = ComprehensiveFeedback.get_all_feedback(db_config)
+        try:
+            comprehensive_feedback_data = load_comprehensive_feedback(db_config)
+        except Exception as e:
+            st.error(f"Error loading comprehensive feedback: {e}")
+            comprehensive_feedback_data = None
         
         if comprehensive_feedback_data:
             # Convert to DataFrame for analysis
             comp_feedback_df = pd.DataFrame([
                 {
-                    'Username': getattr(fb, 'username', 'Unknown'),
-                    'Frequency Rating': fb.frequency_rating,
-                    'Explanation Quality': fb.explanation_quality_rating,
-                    'System Helpfulness': fb.system_helpfulness_rating,
-                    'Learning Improvement': fb.learning_improvement_rating,
-                    'Auto Explanation': fb.auto_explanation,
-                    'System Accuracy': fb.system_accuracy,
-                    'Recommendation': fb.recommendation,
-                    'Date': fb.created_at.strftime('%Y-%m-%d %H:%M')
+                    'Username': fb.get('username', 'Unknown'),
+                    'Frequency Rating': fb['frequency_rating'],
+                    'Explanation Quality': fb['explanation_quality_rating'],
+                    'System Helpfulness': fb['system_helpfulness_rating'],
+                    'Learning Improvement': fb['learning_improvement_rating'],
+                    'Auto Explanation': fb['auto_explanation'],
+                    'System Accuracy': fb['system_accuracy'],
+                    'Recommendation': fb['recommendation'],
+                    'Date': fb['created_at'].strftime('%Y-%m-%d %H:%M')
                 }
                 for fb in comprehensive_feedback_data
             ])
+            comp_feedback_df = compact_dtypes(comp_feedback_df)
             
             st.dataframe(comp_feedback_df, use_container_width=True)
             
@@ -375,13 +405,13 @@ def render_feedback_analysis_tab():
             with col1:
                 st.metric("Total Research Feedback", len(comprehensive_feedback_data))
             with col2:
-                avg_quality = sum(fb.explanation_quality_rating for fb in comprehensive_feedback_data) / len(comprehensive_feedback_data)
+                avg_quality = sum(fb['explanation_quality_rating'] for fb in comprehensive_feedback_data) / len(comprehensive_feedback_data)
                 st.metric("Avg. Explanation Quality", f"{avg_quality:.1f}/5")
             with col3:
-                avg_helpfulness = sum(fb.system_helpfulness_rating for fb in comprehensive_feedback_data) / len(comprehensive_feedback_data)
+                avg_helpfulness = sum(fb['system_helpfulness_rating'] for fb in comprehensive_feedback_data) / len(comprehensive_feedback_data)
                 st.metric("Avg. System Helpfulness", f"{avg_helpfulness:.1f}/5")
             with col4:
-                positive_recommendations = sum(1 for fb in comprehensive_feedback_data if fb.recommendation == 'Yes')
+                positive_recommendations = sum(1 for fb in comprehensive_feedback_data if fb['recommendation'] == 'Yes')
                 st.metric("Positive Recommendations", f"{positive_recommendations}/{len(comprehensive_feedback_data)}")
             
             # Detailed feedback analysis
@@ -422,7 +452,7 @@ def render_feedback_analysis_tab():
             recommendation_counts = comp_feedback_df['Recommendation'].value_counts()
             st.bar_chart(recommendation_counts)
             
-        else:
+        elif comprehensive_feedback_data is not None:
             st.info("No comprehensive research feedback data available yet.")
     else:
         st.warning("ComprehensiveFeedback model not available.")
@@ -430,4 +460,5 @@ def render_feedback_analysis_tab():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     render_evaluation_dashboard() 
\ No newline at end of file
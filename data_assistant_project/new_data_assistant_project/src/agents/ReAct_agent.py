@@ -2,24 +2,270 @@ import pandas as pd
 import re
 from typing import Dict, List, Tuple, Optional
 import json
-from dataclasses import dataclass
 from anthropic import Anthropic
 import logging
 import os
+import asyncio
+import atexit
+import itertools
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
+import psycopg2
+import psycopg2.pool
+from psycopg2 import sql
 
 # PostgreSQL imports
 try:
-    from new_data_assistant_project.src.utils.my_config import MyConfig
+    from new_data_assistant_project.src.utils.my_config import MyConfig, get_config
     from new_data_assistant_project.src.database.postgres_config import PostgresConfig
 except ImportError:
-    from src.utils.my_config import MyConfig
+    from src.utils.my_config import MyConfig, get_config
     from src.database.postgres_config import PostgresConfig
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# PostgreSQL connection pools shared by all agents, keyed by connection config. Each pool is paired
+# with a semaphore of the same size: ThreadedConnectionPool raises PoolError when exhausted instead
+# of waiting, so borrowers queue on the semaphore first
+CONNECTION_POOL_MAX_SIZE = 8
+CONNECTION_WAIT_TIMEOUT_SECONDS = 30.0
+_CONNECTION_POOLS: Dict[tuple, Tuple[psycopg2.pool.ThreadedConnectionPool, threading.BoundedSemaphore]] = {}
+_CONNECTION_POOLS_LOCK = threading.Lock()
+
+def _config_key(database_config: dict) -> tuple:
+    """Hashable identity of a database configuration."""
+    return tuple(sorted((k, str(v)) for k, v in database_config.items()))
+
+def _get_connection_pool(
+    database_config: dict
+) -> Tuple[psycopg2.pool.ThreadedConnectionPool, threading.BoundedSemaphore]:
+    """Get (or lazily create) the connection pool and its borrow semaphore for a database configuration."""
+    key = _config_key(database_config)
+    with _CONNECTION_POOLS_LOCK:
+        entry = _CONNECTION_POOLS.get(key)
+        if entry is None:
+            entry = (
+                psycopg2.pool.ThreadedConnectionPool(minconn=1, maxconn=CONNECTION_POOL_MAX_SIZE, **database_config),
+                threading.BoundedSemaphore(CONNECTION_POOL_MAX_SIZE)
+            )
+            _CONNECTION_POOLS[key] = entry
+        return entry
+
+@atexit.register
+def _close_connection_pools():
+    """Close all pooled connections on interpreter shutdown."""
+    with _CONNECTION_POOLS_LOCK:
+        for pool, _ in _CONNECTION_POOLS.values():
+            pool.closeall()
+        _CONNECTION_POOLS.clear()
+
+# Anthropic clients shared by all agents, keyed by API key, so HTTP keep-alive connections are reused
+_ANTHROPIC_CLIENTS: Dict[str, Anthropic] = {}
+_ANTHROPIC_CLIENTS_LOCK = threading.Lock()
+
+def get_anthropic_client(api_key: str) -> Anthropic:
+    """Get (or lazily create) the shared Anthropic client for an API key."""
+    with _ANTHROPIC_CLIENTS_LOCK:
+        client = _ANTHROPIC_CLIENTS.get(api_key)
+        if client is None:
+            client = Anthropic(api_key=api_key)
+            _ANTHROPIC_CLIENTS[api_key] = client
+        return client
+
+# Concurrent questions per aexecute_many call; kept below CONNECTION_POOL_MAX_SIZE
+AEXECUTE_MAX_CONCURRENCY = 4
+
+# Worker threads for LLM calls that are started ahead of being needed (e.g. explanation prefetch)
+_BACKGROUND_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="react_agent")
+
+class _LRUCache:
+    """Small thread-safe LRU mapping used for the caches shared by all agents; entries optionally expire after ttl seconds."""
+    
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return the cached value (marking it recently used), or None on a miss or once it has expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def put(self, key, value):
+        """Insert a value, evicting the least recently used entries beyond maxsize."""
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl if self.ttl is not None else None)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def discard(self, key):
+        """Remove an entry if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+def _normalize_user_query(user_query: str) -> str:
+    """Collapse whitespace so trivially different spellings of a question share cache entries."""
+    return ' '.join(user_query.split())
+
+# Results of repeated natural-language questions, keyed on (database, question, schema). The database
+# also holds live app tables (users, feedback), so results expire like the dashboard's cached queries
+QUERY_RESULT_CACHE_TTL_SECONDS = 300
+_QUERY_RESULT_CACHE = _LRUCache(maxsize=128, ttl=QUERY_RESULT_CACHE_TTL_SECONDS)
+# Statements whose results must not be replayed from the cache
+_RE_UNCACHEABLE_SQL = re.compile(
+    r'\b(?:INSERT|UPDATE|DELETE|now\s*\(|current_\w+|random\s*\(|clock_timestamp)',
+    re.IGNORECASE
+)
+
+# Generated (sql, reasoning) per question whose SQL executed successfully, keyed on (question, schema, model);
+# skips the LLM on repeats
+_SQL_GENERATION_CACHE = _LRUCache(maxsize=256)
+
+# SQL strings that already passed validation, keyed on (database, sql, schema). The schema text is only
+# re-read hourly, so entries also expire like cached results to notice dropped or renamed objects sooner
+_VALID_SQL_CACHE = _LRUCache(maxsize=256, ttl=QUERY_RESULT_CACHE_TTL_SECONDS)
+
+# On-disk schema cache: served immediately at startup, refreshed in the background once stale
+SCHEMA_CACHE_DIR = Path.home() / ".cache" / "react_agent"
+SCHEMA_CACHE_TTL_SECONDS = 3600
+
+# Schemas with at least this many tables are narrowed to the tables a question mentions
+SCHEMA_SUBSET_MIN_TABLES = 30
+# Foreign key targets recorded on a column line of the schema text
+_RE_SCHEMA_REFERENCES = re.compile(r' REFERENCES ([^\n]+)')
+
+@lru_cache(maxsize=1024)
+def _table_name_pattern(table_name: str) -> re.Pattern:
+    """Whole-word matcher for a table name in its singular and plural forms ('_' also matches a space)."""
+    name = table_name.lower()
+    if name.endswith('ies'):
+        singular = name[:-3] + 'y'
+    elif name.endswith(('ses', 'xes', 'ches', 'shes')):
+        singular = name[:-2]
+    elif name.endswith('s') and not name.endswith('ss') and len(name) > 1:
+        singular = name[:-1]
+    else:
+        singular = name
+    if singular.endswith('y') and len(singular) > 1 and singular[-2] not in 'aeiou':
+        plural = singular[:-1] + 'ies'
+    elif singular.endswith(('s', 'x', 'ch', 'sh')):
+        plural = singular + 'es'
+    else:
+        plural = singular + 's'
+    forms = sorted({name, singular, plural}, key=len, reverse=True)
+    return re.compile(
+        r'\b(?:' + '|'.join(re.escape(form).replace('_', r'[\s_]') for form in forms) + r')\b',
+        re.IGNORECASE
+    )
+
+# Static parts of the SQL generation system prompt; kept byte-identical across calls so the
+# schema block between them can be served from the Anthropic prompt cache
+SQL_SYSTEM_PREAMBLE = (
+    "You are an expert SQL analyst following the ReAct (Reasoning and Acting) approach "
+    "with extended thinking capabilities."
+)
+SQL_SYSTEM_RULES = """IMPORTANT: All SQL operations are now allowed. You can generate any type of SQL query.
+
+Use extended thinking to show your reasoning process step by step. Think through the problem systematically using the ReAct pattern:
+
+1. THOUGHT: Analyze what the user is asking for
+2. ACTION: Determine what SQL operations are needed
+3. OBSERVATION: Consider the database schema and available tables
+4. THOUGHT: Plan the SQL query structure
+5. ACTION: Write the final SQL query
+
+IMPORTANT SQL GENERATION RULES:
+- Generate ONLY ONE SQL SELECT statement
+- Do NOT use multiple SELECT statements or UNION operations
+- Keep queries simple and focused on the main request
+- Use CTEs (WITH clauses) only if absolutely necessary
+- Avoid complex multiple-statement queries
+- Focus on answering the core question with ONE clear query
+
+Show your complete thinking process, then provide the final SQL query.
+Be precise and consider performance implications.
+
+After your thinking, format your final response as:
+REASONING:
+[Summary of your reasoning process]
+
+SQL:
+[Your SQL query - MUST be valid PostgreSQL syntax]"""
+
+# Dead-man switch for streamed responses: abort if no data arrives for this many seconds
+STREAM_STALL_TIMEOUT_SECONDS = 30.0
+
+# A terminated statement after the final 'SQL:' marker; once seen, the rest of the stream is not needed
+_RE_SQL_COMPLETE = re.compile(r'^SQL:[\s\S]*?;[ \t]*(?:\r?\n|```)', re.MULTILINE)
+
+# Upper bound on rows fetched for a generated read-only query; callers only preview the result
+MAX_RESULT_ROWS = 10000
+_RE_READ_ONLY_QUERY = re.compile(r'^\s*(?:SELECT|WITH)\b', re.IGNORECASE)
+_RE_LIMIT_OR_WRITE = re.compile(r'\b(?:LIMIT|FETCH|INSERT|UPDATE|DELETE|INTO)\b', re.IGNORECASE)
+
+# Precompiled patterns used by ReActAgent._clean_sql_query
+# Markdown fences and standalone 'sql' lines, removed in one pass
+_RE_MARKDOWN_ARTIFACTS = re.compile(
+    r"```sql\s*|\s*```(?!sql)|^\s*sql\s*$\n?",
+    re.MULTILINE | re.IGNORECASE
+)
+# First line that starts a SQL statement
+_RE_SQL_START = re.compile(
+    r'^[ \t]*(?:SELECT|INSERT|UPDATE|DELETE|WITH|CREATE|DROP|ALTER)\b',
+    re.MULTILINE | re.IGNORECASE
+)
+# Leading keywords that mark a line as a continuation of the SQL statement
+_SQL_CONTINUATION_KEYWORDS = frozenset({
+    'FROM', 'WHERE', 'GROUP', 'ORDER', 'HAVING', 'LIMIT', 'OFFSET', 'JOIN', 'INNER', 'LEFT', 'RIGHT',
+    'UNION', 'AND', 'OR', 'ON', 'AS', 'IN', 'EXISTS', 'CASE', 'WHEN', 'THEN', 'ELSE', 'END'
+})
+# Line break before the first explanatory line that follows the statement: a line that does not
+# open with a continuation keyword, '(),', a column name followed by ',' or ')', a number, a quote
+# or an operator, and that mentions one of the phrases the model uses to describe its query
+_RE_SQL_END = re.compile(
+    r'\n(?=[^\S\n]*(?=\S)'
+    r'(?![(),]'
+    r'|(?i:' + '|'.join(sorted(_SQL_CONTINUATION_KEYWORDS)) + r')(?=\s|$)'
+    r'|[A-Za-z_][A-Za-z0-9_]*[^\S\n]*[,)]'
+    r'|\d'
+    r'|[\'"]'
+    r'|[-+*/=<>!])'
+    r'[^\n]*?(?:This query|provides|shows|The results))',
+    re.MULTILINE
+)
+
+# Tokens the local SQL checks care about: comments and quoted text are matched whole so the
+# parentheses, quotes and semicolons inside them are skipped; an opener without its terminator
+# is captured as 'unterminated'
+_RE_SQL_LEXEME = re.compile(r"""
+    (?P<comment>--[^\n]*|/\*[\s\S]*?\*/)
+  | \$(?P<tag>[A-Za-z_]\w*|)\$[\s\S]*?\$(?P=tag)\$
+  | (?<![\w$])[Ee]'(?:[^'\\]|\\[\s\S])*'
+  | '[^']*'
+  | "[^"]*"
+  | (?P<unterminated>/\*|\$(?:[A-Za-z_]\w*|)\$|['"])
+  | [();]
+""", re.VERBOSE)
+
 @dataclass
 class QueryResult:
     """Structure for query execution results"""
@@ -29,6 +275,8 @@ class QueryResult:
     error_message: Optional[str]
     execution_time: float
     complexity_score: int  # 1-5 scale for CLT & CFT Agent
+    truncated: bool = False  # True when the rows were cut off at MAX_RESULT_ROWS
+    explanation_future: Optional[Future] = None  # Prefetched get_reasoning_explanation (see execute_query)
 
 class ReActAgent:
     """
@@ -36,28 +284,60 @@ class ReActAgent:
     Follows ReAct (Reasoning and Acting) paradigm for natural language to SQL conversion.
     """
     
-    def __init__(self, database_config: dict = None):
+    # In-process copy of the schema cache shared by all agents: cache path -> (schema_info, timestamp)
+    _schema_memory_cache: Dict[Path, Tuple[str, float]] = {}
+    # Cache paths with a background schema refresh in flight, so rebuilt agents don't start another
+    _schema_refreshes_in_flight: set = set()
+    _schema_refresh_lock = threading.Lock()
+    
+    # Query complexity patterns for cognitive load assessment
+    complexity_patterns = {
+        1: ['SELECT', 'simple'],  # Basic queries
+        2: ['WHERE', 'GROUP BY', 'ORDER BY'],  # Filtering and grouping
+        3: ['JOIN', 'INNER JOIN', 'LEFT JOIN'],  # Simple joins
+        4: ['SUBQUERY', 'HAVING', 'CASE WHEN'],  # Complex logic
+        5: ['WINDOW FUNCTION', 'CTE', 'MULTIPLE JOINS']  # Advanced operations
+    }
+    
+    # Single-pass keyword matcher over all complexity patterns, compiled once per process
+    # (longest alternatives first so 'INNER JOIN' wins over 'JOIN'); keys are uppercased to match
+    # the normalized keyword looked up in _assess_query_complexity
+    _PATTERN_LEVEL = {
+        pattern.upper(): level
+        for level, patterns in complexity_patterns.items()
+        for pattern in patterns
+    }
+    _COMPLEXITY_RE = re.compile(
+        r'\b(?:' + '|'.join(
+            re.escape(pattern).replace(r'\ ', r'\s+')
+            for pattern in sorted(_PATTERN_LEVEL, key=len, reverse=True)
+        ) + r')\b',
+        re.IGNORECASE
+    )
+    
+    def __init__(self, database_config: dict = None, config: MyConfig = None):
         """
         Initialize ReAct Agent with PostgreSQL connection and API client.
         
         Args:
             database_config: PostgreSQL connection configuration dictionary
+            config: Already loaded MyConfig to reuse instead of loading a new one
         """
         # Initialize API client with better error handling
         try:
-            config = MyConfig()
+            config = config or get_config()
             api_key = config.get_api_key()
             if not api_key:
                 raise ValueError("No API key found in configuration")
             
             # Validate API key format
             if not api_key.startswith('sk-ant-'):
-                logger.warning(f"API key format seems incorrect: {api_key[:10]}...")
+                logger.warning("API key format seems incorrect: %s...", api_key[:10])
             
-            self.client = Anthropic(api_key=api_key)
-            logger.info(f"Successfully initialized Anthropic client with key: {api_key[:10]}...")
+            self.client = get_anthropic_client(api_key)
+            logger.info("Successfully initialized Anthropic client with key: %s...", api_key[:10])
         except Exception as e:
-            logger.error(f"Failed to initialize Anthropic client: {e}")
+            logger.error("Failed to initialize Anthropic client: %s", e)
             raise
 
         # Use provided database config or get from MyConfig
@@ -67,28 +347,147 @@ class ReActAgent:
             self.database_config = config.get_postgres_config()
         
         # Log database config (without password)
-        safe_config = {k: v for k, v in self.database_config.items() if k != 'password'}
-        safe_config['password'] = '***' if 'password' in self.database_config else 'None'
-        logger.info(f"Database config: {safe_config}")
+        logger.info(
+            "Database config: host=%s port=%s database=%s user=%s password=%s",
+            self.database_config.get('host'),
+            self.database_config.get('port'),
+            self.database_config.get('database') or self.database_config.get('dbname'),
+            self.database_config.get('user'),
+            '***' if 'password' in self.database_config else 'None'
+        )
         
         self.model = "claude-sonnet-4-20250514"  # Using latest available Sonnet model
         
-        # Initialize database schema cache with fallback
+        # Database schema is loaded on first access (see schema_info) so construction stays cheap
+        self._schema_info: Optional[str] = None
+        self._schema_lock = threading.Lock()
+        # (schema_text, blocks) pair, swapped as one object so concurrent callers never mix them
+        self._system_blocks: Optional[Tuple[str, List[dict]]] = None
+    
+    @property
+    def schema_info(self) -> str:
+        """Database schema description, loaded on first access."""
+        if self._schema_info is None:
+            with self._schema_lock:
+                if self._schema_info is None:
+                    self._schema_info = self._load_schema()
+        return self._schema_info
+    
+    def _load_schema(self) -> str:
+        """Load the schema from the disk cache, falling back to a live fetch."""
+        cached_schema = self._load_cached_schema()
+        if cached_schema:
+            schema_info, cached_at = cached_schema
+            logger.info("Schema loaded from cache: %s characters", len(schema_info))
+            if time.time() - cached_at > SCHEMA_CACHE_TTL_SECONDS:
+                # Serve the stale schema now and revalidate without blocking the caller
+                self._start_background_refresh()
+            return schema_info
         try:
-            self.schema_info = self._get_database_schema()
-            logger.info(f"Schema loaded successfully: {len(self.schema_info)} characters")
+            schema_info = self._get_database_schema()
+            logger.info("Schema loaded successfully: %s characters", len(schema_info))
         except Exception as e:
-            logger.error(f"Failed to load database schema: {e}")
-            self.schema_info = self._get_fallback_schema()
+            logger.error("Failed to load database schema: %s", e)
+            schema_info = self._get_fallback_schema()
+        return schema_info
+    
+    @contextmanager
+    def _connection(self, autocommit: bool = False):
+        """
+        Borrow a pooled PostgreSQL connection, waiting while all are in use; it is returned
+        (and rolled back if needed) on exit.
+        Read-only catalog paths pass autocommit=True to skip the implicit BEGIN/ROLLBACK.
+        """
+        pool, available = _get_connection_pool(self.database_config)
+        # Wait for a free connection rather than letting getconn() fail when all are borrowed
+        if not available.acquire(timeout=CONNECTION_WAIT_TIMEOUT_SECONDS):
+            raise psycopg2.pool.PoolError(
+                f"No PostgreSQL connection became available within {CONNECTION_WAIT_TIMEOUT_SECONDS:.0f}s"
+            )
+        try:
+            conn = pool.getconn()
+            if conn.closed:
+                # Connection was dropped while idle in the pool - replace it
+                pool.putconn(conn, close=True)
+                conn = pool.getconn()
+            try:
+                if conn.autocommit != autocommit:
+                    conn.autocommit = autocommit
+                yield conn
+            finally:
+                pool.putconn(conn)
+        finally:
+            available.release()
+    
+    def _schema_cache_path(self) -> Path:
+        """Path of the schema cache file for this agent's database."""
+        cfg = self.database_config
+        name = f"schema_{cfg.get('host')}_{cfg.get('port')}_{cfg.get('database') or cfg.get('dbname')}.pkl"
+        return SCHEMA_CACHE_DIR / re.sub(r'[^A-Za-z0-9_.-]', '_', name)
+    
+    def _load_cached_schema(self) -> Optional[Tuple[str, float]]:
+        """Load (schema_info, timestamp) from the in-process or disk cache, or None if unavailable."""
+        cache_path = self._schema_cache_path()
+        cached = ReActAgent._schema_memory_cache.get(cache_path)
+        if cached:
+            return cached
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            ReActAgent._schema_memory_cache[cache_path] = (cached['schema_info'], cached['timestamp'])
+            return cached['schema_info'], cached['timestamp']
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable schema cache: %s", e)
+            return None
+    
+    def _save_cached_schema(self, schema_info: str):
+        """Record the schema with the current time in the in-process cache and atomically on disk."""
+        cache_path = self._schema_cache_path()
+        timestamp = time.time()
+        ReActAgent._schema_memory_cache[cache_path] = (schema_info, timestamp)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'schema_info': schema_info, 'timestamp': timestamp}, f)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning("Could not write schema cache: %s", e)
+    
+    def refresh_schema(self) -> Optional[str]:
+        """
+        Re-fetch the schema from the database, bypassing the disk cache, and swap it in.
+        Also used as the background revalidation target when the cached schema is stale.
+        Returns None (keeping the current schema) if the database can't be read.
+        """
+        try:
+            schema_info = self._get_database_schema()
+        except Exception as e:
+            logger.warning("Schema refresh failed, keeping current schema: %s", e)
+            return None
+        self._schema_info = schema_info
+        self._system_blocks = None
+        logger.info("Schema refreshed: %s characters", len(schema_info))
+        return schema_info
+    
+    def _start_background_refresh(self):
+        """Run refresh_schema on a daemon thread unless a refresh for the same cache file is already running."""
+        cache_path = self._schema_cache_path()
+        with ReActAgent._schema_refresh_lock:
+            if cache_path in ReActAgent._schema_refreshes_in_flight:
+                return
+            ReActAgent._schema_refreshes_in_flight.add(cache_path)
         
-        # Query complexity patterns for cognitive load assessment
-        self.complexity_patterns = {
-            1: ['SELECT', 'simple'],  # Basic queries
-            2: ['WHERE', 'GROUP BY', 'ORDER BY'],  # Filtering and grouping
-            3: ['JOIN', 'INNER JOIN', 'LEFT JOIN'],  # Simple joins
-            4: ['SUBQUERY', 'HAVING', 'CASE WHEN'],  # Complex logic
-            5: ['WINDOW FUNCTION', 'CTE', 'MULTIPLE JOINS']  # Advanced operations
-        }
+        def refresh():
+            try:
+                self.refresh_schema()
+            finally:
+                with ReActAgent._schema_refresh_lock:
+                    ReActAgent._schema_refreshes_in_flight.discard(cache_path)
+        
+        threading.Thread(target=refresh, daemon=True).start()
     
     def _get_fallback_schema(self) -> str:
         """Provide fallback schema information when database connection fails."""
@@ -121,86 +520,96 @@ Table: orders
 This is a sample retail/superstore dataset with order information, customer details, and sales metrics."""
     
     def _get_database_schema(self) -> str:
-        """Extract PostgreSQL database schema information for context."""
+        """
+        Extract PostgreSQL database schema information for context.
+        Errors propagate so callers can choose between the fallback schema and the one they already hold.
+        """
         try:
-            import psycopg2
-            
-            # Test connection first
             logger.info("Testing PostgreSQL connection...")
-            conn = psycopg2.connect(**self.database_config)
-            logger.info("PostgreSQL connection successful")
-            
-            cursor = conn.cursor()
-            
-            # Show all available tables
-            schema_info = "PostgreSQL Database Schema (All tables available):\n"
+            with self._connection(autocommit=True) as conn:
+                logger.info("PostgreSQL connection successful")
+                
+                # Fetch every column of every public table plus the planner's row estimate and the tables the
+                # column references via foreign keys in one round trip, reading pg_catalog directly rather
+                # than the slower information_schema views
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT c.relname, a.attname, format_type(a.atttypid, a.atttypmod), a.attnotnull,
+                               pg_get_expr(d.adbin, d.adrelid), c.reltuples::bigint,
+                               (SELECT string_agg(DISTINCT r.relname, ', ')
+                                FROM pg_constraint fk
+                                JOIN pg_class r ON r.oid = fk.confrelid
+                                WHERE fk.conrelid = c.oid AND fk.contype = 'f' AND a.attnum = ANY(fk.conkey))
+                        FROM pg_class c
+                        JOIN pg_namespace n ON n.oid = c.relnamespace
+                        JOIN pg_attribute a ON a.attrelid = c.oid
+                        LEFT JOIN pg_attrdef d ON d.adrelid = c.oid AND d.adnum = a.attnum
+                        WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p', 'v', 'f')
+                          AND a.attnum > 0 AND NOT a.attisdropped
+                        ORDER BY c.relname, a.attnum;
+                    """)
+                    rows = cursor.fetchall()
             
-            # Get all table names
-            cursor.execute("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'public'
-                ORDER BY table_name;
-            """)
-            tables = cursor.fetchall()
-            logger.info(f"Found {len(tables)} tables in database")
+            # Show all available tables; collect the pieces and join once at the end
+            parts = ["PostgreSQL Database Schema (All tables available):\n"]
+            table_count = 0
             
-            for table in tables:
-                table_name = table[0]
-                schema_info += f"\nTable: {table_name}\n"
+            for table_name, columns in itertools.groupby(rows, key=lambda row: row[0]):
+                columns = list(columns)
+                table_count += 1
+                parts.append(f"\nTable: {table_name}\n")
                 
-                # Get table info
-                cursor.execute("""
-                    SELECT column_name, data_type, is_nullable, column_default
-                    FROM information_schema.columns 
-                    WHERE table_schema = 'public' AND table_name = %s
-                    ORDER BY ordinal_position;
-                """, (table_name,))
-                columns = cursor.fetchall()
+                for _, column_name, data_type, not_null, column_default, _, referenced_tables in columns:
+                    parts.append(f"  - {column_name} ({data_type})")
+                    if not_null:
+                        parts.append(" NOT NULL")
+                    if column_default:
+                        parts.append(f" DEFAULT {column_default}")
+                    if referenced_tables:
+                        parts.append(f" REFERENCES {referenced_tables}")
+                    parts.append("\n")
                 
-                for col in columns:
-                    schema_info += f"  - {col[0]} ({col[1]})"
-                    if col[2] == 'NO':
-                        schema_info += " NOT NULL"
-                    if col[3]:
-                        schema_info += f" DEFAULT {col[3]}"
-                    schema_info += "\n"
-                
-                # Add sample data info
-                try:
-                    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                    row_count = cursor.fetchone()[0]
-                    schema_info += f"  Total rows: {row_count}\n"
-                except Exception as e:
-                    logger.warning(f"Could not count rows for {table_name}: {e}")
-                    schema_info += f"  Could not count rows\n"
+                # Add sample data info (reltuples is -1 until the table has been analyzed)
+                row_estimate = columns[0][5]
+                if row_estimate is not None and row_estimate >= 0:
+                    parts.append(f"  Total rows: ~{row_estimate}\n")
+                else:
+                    parts.append("  Total rows: unknown\n")
             
-            cursor.close()
-            conn.close()
+            schema_info = "".join(parts)
+            logger.info("Found %s tables in database", table_count)
+            self._save_cached_schema(schema_info)
             return schema_info
         except Exception as e:
-            logger.error(f"Error getting PostgreSQL database schema: {e}")
-            # Return fallback schema instead of empty string
-            return self._get_fallback_schema()
+            logger.error("Error getting PostgreSQL database schema: %s", e)
+            raise
     
-    def _assess_query_complexity(self, sql_query: str) -> int:
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _assess_query_complexity(sql_query: str) -> int:
         """
         Assess SQL query complexity for CLT & CFT Agent.
         Returns complexity score 1-5 based on SQL features.
+        Memoized per SQL string (the score depends only on the text), shared by all agents.
         """
-        sql_upper = sql_query.upper()
         complexity_score = 1
+        select_count = 0
+        join_count = 0
         
-        for level, patterns in self.complexity_patterns.items():
-            for pattern in patterns:
-                if pattern in sql_upper:
-                    complexity_score = max(complexity_score, level)
+        # One scan over the SQL collects the highest level and the SELECT/JOIN counts
+        for match in ReActAgent._COMPLEXITY_RE.finditer(sql_query):
+            keyword = ' '.join(match.group().upper().split())
+            complexity_score = max(complexity_score, ReActAgent._PATTERN_LEVEL[keyword])
+            if keyword == 'SELECT':
+                select_count += 1
+            elif keyword.endswith('JOIN'):
+                join_count += 1
         
         # Additional complexity factors
-        if sql_upper.count('SELECT') > 1:  # Subqueries
+        if select_count > 1:  # Subqueries
             complexity_score = max(complexity_score, 4)
         
-        if sql_upper.count('JOIN') > 1:  # Multiple joins
+        if join_count > 1:  # Multiple joins
             complexity_score = max(complexity_score, 5)
         
         return min(complexity_score, 5)
@@ -212,45 +621,15 @@ This is a sample retail/superstore dataset with order information, customer deta
         if not sql_query or not isinstance(sql_query, str):
             return ""
         
-        # Remove markdown code blocks
-        sql_query = re.sub(r'```sql\s*', '', sql_query, flags=re.MULTILINE | re.IGNORECASE)
-        sql_query = re.sub(r'\s*```', '', sql_query, flags=re.MULTILINE)
-        
-        # Remove Anthropic API type annotations that may have leaked through
-        sql_query = re.sub(r"', type='text'\)", '', sql_query)
-        sql_query = re.sub(r"type='text'", '', sql_query)
-        
-        # Remove standalone 'sql' lines
-        sql_query = re.sub(r'^\s*sql\s*$', '', sql_query, flags=re.MULTILINE | re.IGNORECASE)
-        sql_query = re.sub(r'^\s*sql\s*\n', '', sql_query, flags=re.MULTILINE | re.IGNORECASE)
+        # Remove markdown code blocks and standalone 'sql' lines
+        sql_query = _RE_MARKDOWN_ARTIFACTS.sub('', sql_query)
         
         # Find the actual SQL statement (starts with SELECT, INSERT, UPDATE, DELETE, WITH, etc.)
-        lines = sql_query.split('\n')
-        sql_lines = []
-        found_sql_start = False
-        
-        for line in lines:
-            line_stripped = line.strip().upper()
-            
-            # Start collecting lines when we find a SQL statement
-            if not found_sql_start and any(line_stripped.startswith(keyword) for keyword in 
-                                         ['SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'CREATE', 'DROP', 'ALTER']):
-                found_sql_start = True
-                sql_lines.append(line)
-            elif found_sql_start:
-                # Stop collecting if we hit explanatory text
-                if (line.strip() and 
-                    not line_stripped.startswith(('FROM', 'WHERE', 'GROUP', 'ORDER', 'HAVING', 'LIMIT', 'OFFSET', 'JOIN', 'INNER', 'LEFT', 'RIGHT', 'UNION', 'AND', 'OR', 'ON', 'AS', 'IN', 'EXISTS', 'CASE', 'WHEN', 'THEN', 'ELSE', 'END', ')', '(', ',')) and
-                    not re.match(r'^\s*[A-Za-z_][A-Za-z0-9_]*\s*[,\)]', line) and  # Column names
-                    not re.match(r'^\s*\d+', line) and  # Numbers
-                    not re.match(r'^\s*[\'"]', line) and  # String literals
-                    not re.match(r'^\s*[-+*/=<>!]', line) and  # Operators
-                    ('This query' in line or 'provides' in line or 'shows' in line or 'The results' in line)):
-                    break
-                sql_lines.append(line)
-        
-        if sql_lines:
-            sql_query = '\n'.join(sql_lines)
+        sql_start = _RE_SQL_START.search(sql_query)
+        if sql_start:
+            # The statement runs until the first explanatory line (or the end of the text)
+            sql_end = _RE_SQL_END.search(sql_query, sql_start.end())
+            sql_query = sql_query[sql_start.start():sql_end.start() if sql_end else len(sql_query)]
         
         # Final cleanup
         sql_query = sql_query.strip()
@@ -264,82 +643,158 @@ This is a sample retail/superstore dataset with order information, customer deta
         
         return sql_query
     
+    def _strip_statement_terminator(self, sql_query: str) -> str:
+        """Drop the trailing ';' and any comments or whitespace after the last token of the statement."""
+        body_end = 0
+        last_end = 0
+        for lexeme in _RE_SQL_LEXEME.finditer(sql_query):
+            gap = sql_query[last_end:lexeme.start()]
+            if gap.strip():
+                body_end = last_end + len(gap.rstrip())
+            if not (lexeme.group('comment') or lexeme.group() == ';'):
+                body_end = lexeme.end()
+            last_end = lexeme.end()
+        gap = sql_query[last_end:]
+        if gap.strip():
+            body_end = last_end + len(gap.rstrip())
+        return sql_query[:body_end]
+    
+    def _apply_row_cap(self, sql_query: str) -> str:
+        """
+        Wrap a read-only query without its own LIMIT so PostgreSQL returns at most MAX_RESULT_ROWS + 1 rows
+        (the extra row tells execute_query the result was truncated).
+        """
+        if not _RE_READ_ONLY_QUERY.match(sql_query) or _RE_LIMIT_OR_WRITE.search(sql_query):
+            return sql_query
+        if self._local_syntax_error(sql_query):
+            # Leave malformed SQL untouched so PostgreSQL reports the error against the original text
+            return sql_query
+        # The closing parenthesis goes on its own line so a '--' comment inside the query can't swallow it
+        return f"SELECT * FROM (\n{self._strip_statement_terminator(sql_query)}\n) AS capped_result LIMIT {MAX_RESULT_ROWS + 1}"
+    
+    def _fetch_dataframe(self, conn, sql_query, params: tuple = None) -> Optional[pd.DataFrame]:
+        """
+        Run a query on a plain cursor and build the DataFrame directly from the fetched rows.
+        Returns None when the statement produced no result set (e.g. DML or DDL).
+        """
+        with conn.cursor() as cursor:
+            cursor.execute(sql_query, params)
+            if cursor.description is None:
+                return None
+            columns = [column.name for column in cursor.description]
+            rows = cursor.fetchall()
+        # coerce_float matches read_sql_query's Decimal -> float conversion
+        return pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+    
+    def _schema_for_query(self, user_query: str) -> str:
+        """
+        Schema text for the SQL prompt. Large schemas are narrowed to the tables the question names
+        (as whole words, singular or plural) plus the tables linked to them by foreign keys, so join
+        partners the question doesn't name are kept. Small schemas, and schemas without foreign key
+        information, are sent whole so the prompt-cache prefix stays stable and no join is lost.
+        """
+        schema_info = self.schema_info
+        header, *table_blocks = schema_info.split("\nTable: ")
+        if len(table_blocks) < SCHEMA_SUBSET_MIN_TABLES or " REFERENCES " not in schema_info:
+            return schema_info
+        
+        blocks_by_name = {block.split("\n", 1)[0]: block for block in table_blocks}
+        matched = {name for name in blocks_by_name if _table_name_pattern(name).search(user_query)}
+        if not matched:
+            return schema_info
+        references = {
+            name: {table for tables in _RE_SCHEMA_REFERENCES.findall(block) for table in tables.split(", ")}
+            for name, block in blocks_by_name.items()
+        }
+        selected = set(matched)
+        for name, referenced in references.items():
+            if name in matched:
+                selected |= referenced
+            elif referenced & matched:
+                selected.add(name)
+        logger.info("Narrowed schema to %s of %s tables", len(selected), len(table_blocks))
+        return header + "".join("\nTable: " + block for name, block in blocks_by_name.items() if name in selected)
+    
+    def _get_system_blocks(self, schema_text: str) -> List[dict]:
+        """System prompt blocks for SQL generation, rebuilt only when the schema text changes."""
+        cached = self._system_blocks
+        # Identity check against the held reference (not id()) so a freed string can't alias a new one
+        if cached is not None and cached[0] is schema_text:
+            return cached[1]
+        # Only the schema block varies between deployments; marking it cacheable lets the
+        # API reuse the processed preamble + schema prefix on subsequent calls
+        system_blocks = [
+            {"type": "text", "text": SQL_SYSTEM_PREAMBLE},
+            {"type": "text", "text": schema_text, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": SQL_SYSTEM_RULES}
+        ]
+        self._system_blocks = (schema_text, system_blocks)
+        return system_blocks
+    
     def _generate_sql_with_reasoning(self, user_query: str) -> Tuple[str, str]:
         """
         Generate SQL query using ReAct reasoning pattern with Extended Thinking.
         Returns both the SQL query and the reasoning process.
+        Generations whose SQL executed successfully (recorded by execute_query) are reused for repeats
+        of the same question against the same schema.
         """
-        system_prompt = f"""You are an expert SQL analyst following the ReAct (Reasoning and Acting) approach with extended thinking capabilities.
-        
-        {self.schema_info}
-        
-        IMPORTANT: All SQL operations are now allowed. You can generate any type of SQL query.
+        cached = _SQL_GENERATION_CACHE.get(self._sql_generation_key(user_query))
+        if cached is not None:
+            logger.info("Reusing generated SQL for query: %s", user_query)
+            return cached
         
-        Use extended thinking to show your reasoning process step by step. Think through the problem systematically using the ReAct pattern:
-        
-        1. THOUGHT: Analyze what the user is asking for
-        2. ACTION: Determine what SQL operations are needed  
-        3. OBSERVATION: Consider the database schema and available tables
-        4. THOUGHT: Plan the SQL query structure
-        5. ACTION: Write the final SQL query
-        
-        IMPORTANT SQL GENERATION RULES:
-        - Generate ONLY ONE SQL SELECT statement 
-        - Do NOT use multiple SELECT statements or UNION operations
-        - Keep queries simple and focused on the main request
-        - Use CTEs (WITH clauses) only if absolutely necessary
-        - Avoid complex multiple-statement queries
-        - Focus on answering the core question with ONE clear query
-        
-        Show your complete thinking process, then provide the final SQL query.
-        Be precise and consider performance implications.
-        
-        After your thinking, format your final response as:
-        REASONING:
-        [Summary of your reasoning process]
-        
-        SQL:
-        [Your SQL query - MUST be valid PostgreSQL syntax]"""
+        return self._request_sql_with_reasoning(user_query)
+    
+    def _sql_generation_key(self, user_query: str) -> tuple:
+        """Key of a question's entry in the shared SQL generation cache."""
+        return (_normalize_user_query(user_query), hash(self.schema_info), self.model)
+    
+    def _request_sql_with_reasoning(self, user_query: str) -> Tuple[str, str]:
+        """Ask the model for SQL and reasoning (uncached)."""
+        system_blocks = self._get_system_blocks(self._schema_for_query(user_query))
         
         try:
-            logger.info(f"Generating SQL for query: {user_query}")
-            logger.info(f"Using model: {self.model}")
+            logger.info("Generating SQL for query: %s", user_query)
+            logger.info("Using model: %s", self.model)
             
-            response = self.client.messages.create(
+            # Stream the response so parsing can start as soon as the SQL statement is complete
+            text_chunks = []
+            
+            with self.client.messages.stream(
                 model=self.model,
                 max_tokens=2000,  # Increased for Extended Thinking
                 temperature=0.1,
-                system=system_prompt,
+                system=system_blocks,
                 messages=[{
                     "role": "user", 
                     "content": f"Generate SQL for: {user_query}"
-                }]
-            )
+                }],
+                # Applies per network read, so a stalled stream fails fast instead of hanging the UI
+                timeout=STREAM_STALL_TIMEOUT_SECONDS
+            ) as stream:
+                for text_content in stream.text_stream:
+                    text_chunks.append(text_content)
+                    # The statement can only become complete on a chunk carrying a newline or fence
+                    if ('\n' in text_content or '`' in text_content) and _RE_SQL_COMPLETE.search("".join(text_chunks)):
+                        logger.info("Complete SQL statement received, closing response stream early")
+                        break
+                response_snapshot = stream.current_message_snapshot
             
-            # Extract content from the response including thinking blocks
-            reasoning_text = ""
-            final_content = ""
-            
-            for block in response.content:
-                if hasattr(block, 'type'):
-                    if block.type == 'thinking':
-                        # Capture thinking content using correct field
-                        thinking_content = getattr(block, 'thinking', '')
-                        reasoning_text += f"THINKING:\n{thinking_content}\n\n"
-                    elif block.type == 'text':
-                        # Capture regular text content
-                        text_content = getattr(block, 'text', str(block))
-                        final_content += text_content
-                else:
-                    # Fallback for older format
-                    final_content += str(block)
+            final_content = "".join(text_chunks)
+            # Thinking blocks arrive in the message snapshot rather than the text stream
+            reasoning_text = "".join(
+                f"THINKING:\n{block.thinking}\n\n"
+                for block in response_snapshot.content
+                if getattr(block, 'type', None) == 'thinking'
+            )
             
             # Combine thinking and final content for logging
             total_content = reasoning_text + final_content
-            logger.info(f"API response received: {len(total_content)} characters")
+            logger.info("API response received: %s characters", len(total_content))
             if reasoning_text:
-                logger.info(f"Extended thinking captured: {len(reasoning_text)} characters")
-            logger.debug(f"Raw API response: {total_content[:500]}...")
+                logger.info("Extended thinking captured: %s characters", len(reasoning_text))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Raw API response: %s...", total_content[:500])
             
             # Use final_content for SQL extraction, reasoning_text + extracted reasoning for full reasoning
             content_to_process = final_content or total_content
@@ -356,7 +811,7 @@ This is a sample retail/superstore dataset with order information, customer deta
                 # Clean SQL query comprehensively
                 sql_query = self._clean_sql_query(sql_query)
                 
-                logger.info(f"SQL query extracted: {sql_query[:100]}...")
+                logger.info("SQL query extracted: %s...", sql_query[:100])
                 
                 return sql_query, full_reasoning
             else:
@@ -364,32 +819,62 @@ This is a sample retail/superstore dataset with order information, customer deta
                 logger.warning("API response format not as expected, trying fallback extraction")
                 cleaned_content = self._clean_sql_query(content_to_process)
                 if cleaned_content:
-                    logger.info(f"Fallback SQL extraction successful: {cleaned_content[:100]}...")
+                    logger.info("Fallback SQL extraction successful: %s...", cleaned_content[:100])
                     return cleaned_content, reasoning_text or "Reasoning not available"
                 else:
                     logger.error("No SQL query could be extracted from API response")
                     return "", reasoning_text or "Could not extract SQL from response"
                 
         except Exception as e:
-            logger.error(f"Error generating SQL: {e}")
+            logger.error("Error generating SQL: %s", e)
             logger.exception("Full traceback:")
             return "", f"I encountered an error while processing your request: {str(e)}"
     
-    def execute_query(self, user_query: str) -> QueryResult:
+    def _get_cached_result(self, cache_key: tuple, start_time: float) -> Optional[QueryResult]:
+        """Return a copy of a cached QueryResult (marking it recently used), or None on a miss."""
+        cached = _QUERY_RESULT_CACHE.get(cache_key)
+        if cached is None:
+            return None
+        # Shallow DataFrame copy so callers can't mutate the cached frame's structure
+        result = replace(cached, data=cached.data.copy(deep=False), execution_time=time.perf_counter() - start_time)
+        result.reasoning = cached.reasoning
+        return result
+    
+    def _store_cached_result(self, cache_key: tuple, query_result: QueryResult):
+        """Insert a successful QueryResult into the shared LRU cache."""
+        # The explanation Future belongs to the call that started it, not to later cache hits
+        cached = replace(query_result, data=query_result.data.copy(deep=False), explanation_future=None)
+        cached.reasoning = query_result.reasoning
+        _QUERY_RESULT_CACHE.put(cache_key, cached)
+    
+    def execute_query(self, user_query: str, prefetch_explanation: bool = False) -> QueryResult:
         """
         Main method to process natural language query using ReAct approach with PostgreSQL.
         
         Args:
             user_query: Natural language data analysis request
+            prefetch_explanation: Start get_reasoning_explanation in the background as soon as the SQL
+                is generated (or a cached result is served); the Future is set as the result's
+                `explanation_future`, which stays None if the query fails
             
         Returns:
             QueryResult with execution results and metadata
         """
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter()
+        explanation_future = None
         
         try:
-            logger.info(f"Starting query execution for: {user_query}")
+            logger.info("Starting query execution for: %s", user_query)
+            
+            cache_key = (_config_key(self.database_config), _normalize_user_query(user_query), hash(self.schema_info))
+            cached_result = self._get_cached_result(cache_key, start_time)
+            if cached_result is not None:
+                logger.info("Serving cached result for: %s", user_query)
+                if prefetch_explanation:
+                    cached_result.explanation_future = self.get_reasoning_explanation_async(
+                        cached_result.sql_query, user_query
+                    )
+                return cached_result
             
             # Step 1: Generate SQL using ReAct reasoning
             sql_query, reasoning = self._generate_sql_with_reasoning(user_query)
@@ -401,32 +886,55 @@ This is a sample retail/superstore dataset with order information, customer deta
                     data=None,
                     sql_query="",
                     error_message="I couldn't generate a SQL query for your request. This might be due to API connectivity issues or the request being unclear. Please try rephrasing your question.",
-                    execution_time=time.time() - start_time,
+                    execution_time=time.perf_counter() - start_time,
                     complexity_score=1
                 )
             
+            # Overlap the explanation LLM call with query execution when the caller will want it
+            explanation_future = (
+                self.get_reasoning_explanation_async(sql_query, user_query) if prefetch_explanation else None
+            )
+            
             # Step 2: SQL validation removed - all queries are now allowed
             # The agent only receives instructions and does not share user information
             
             # Step 3: Assess query complexity for CLT & CFT Agent
             complexity_score = self._assess_query_complexity(sql_query)
-            logger.info(f"Query complexity score: {complexity_score}")
+            logger.info("Query complexity score: %s", complexity_score)
             
             # Step 4: Execute SQL query using PostgreSQL
             try:
-                import psycopg2
-                logger.info("Connecting to PostgreSQL for query execution")
-                conn = psycopg2.connect(**self.database_config)
+                logger.info("Acquiring pooled PostgreSQL connection for query execution")
+                with self._connection() as conn:
+                    # Execute query and get results
+                    logger.info("Executing SQL: %s", sql_query)
+                    result_df = self._fetch_dataframe(conn, self._apply_row_cap(sql_query))
+                
+                if result_df is None:
+                    # The connection is transactional and rolled back when returned to the pool, so
+                    # whatever the statement changed was discarded; don't report (or cache) it as a success
+                    logger.error("Statement produced no result set: %s", sql_query)
+                    _SQL_GENERATION_CACHE.discard(self._sql_generation_key(user_query))
+                    if explanation_future is not None:
+                        explanation_future.cancel()
+                    return QueryResult(
+                        success=False,
+                        data=None,
+                        sql_query=sql_query,
+                        error_message="The statement produced no result set; changes are not committed. Please ask a question that can be answered with a query returning data.",
+                        execution_time=time.perf_counter() - start_time,
+                        complexity_score=complexity_score
+                    )
                 
-                # Execute query and get results
-                logger.info(f"Executing SQL: {sql_query}")
-                result_df = pd.read_sql_query(sql_query, conn)
-                conn.close()
+                truncated = len(result_df) > MAX_RESULT_ROWS
+                if truncated:
+                    result_df = result_df.iloc[:MAX_RESULT_ROWS]
+                    logger.warning("Result truncated to %s rows", MAX_RESULT_ROWS)
                 
-                execution_time = time.time() - start_time
+                execution_time = time.perf_counter() - start_time
                 
-                logger.info(f"Query executed successfully. Complexity: {complexity_score}, Rows: {len(result_df)}, Time: {execution_time:.2f}s")
-                logger.info(f"Reasoning: {reasoning[:100]}...")
+                logger.info("Query executed successfully. Complexity: %s, Rows: %s, Time: %.2fs", complexity_score, len(result_df), execution_time)
+                logger.info("Reasoning: %s...", reasoning[:100])
                 
                 # Create QueryResult with reasoning
                 query_result = QueryResult(
@@ -435,40 +943,75 @@ This is a sample retail/superstore dataset with order information, customer deta
                     sql_query=sql_query,
                     error_message=None,
                     execution_time=execution_time,
-                    complexity_score=complexity_score
+                    complexity_score=complexity_score,
+                    truncated=truncated,
+                    explanation_future=explanation_future
                 )
                 
                 # Add reasoning as an attribute (even though not in dataclass)
                 query_result.reasoning = reasoning
                 
+                # Only SQL that actually ran is worth replaying for the same question
+                _SQL_GENERATION_CACHE.put(self._sql_generation_key(user_query), (sql_query, reasoning))
+                if not _RE_UNCACHEABLE_SQL.search(sql_query):
+                    self._store_cached_result(cache_key, query_result)
+                
                 return query_result
                 
             except psycopg2.Error as e:
                 # Log the actual error for debugging but return user-friendly message
-                logger.error(f"PostgreSQL execution error: {str(e)}")
-                logger.error(f"Failed SQL query: {sql_query}")
+                logger.error("PostgreSQL execution error: %s", e)
+                logger.error("Failed SQL query: %s", sql_query)
+                # Let a retry of the same question ask the model again instead of replaying the failure
+                _SQL_GENERATION_CACHE.discard(self._sql_generation_key(user_query))
+                # No explanation is wanted for SQL that failed; drop it if it hasn't started yet
+                if explanation_future is not None:
+                    explanation_future.cancel()
                 return QueryResult(
                     success=False,
                     data=None,
                     sql_query=sql_query,
                     error_message=f"I encountered a database error while executing the query. The query might have syntax issues or reference non-existent tables/columns. Error: {str(e)}",
-                    execution_time=time.time() - start_time,
+                    execution_time=time.perf_counter() - start_time,
                     complexity_score=complexity_score
                 )
                     
         except Exception as e:
             # Log the actual error for debugging but return user-friendly message
-            logger.error(f"Processing error in ReAct agent: {str(e)}")
+            logger.error("Processing error in ReAct agent: %s", e)
             logger.exception("Full traceback:")
+            if explanation_future is not None:
+                explanation_future.cancel()
             return QueryResult(
                 success=False,
                 data=None,
                 sql_query="",
                 error_message=f"I'm having trouble processing your request right now. Error details: {str(e)}. Please try again with a different question about the business data.",
-                execution_time=time.time() - start_time,
+                execution_time=time.perf_counter() - start_time,
                 complexity_score=1
             )
     
+    async def aexecute_query(self, user_query: str) -> QueryResult:
+        """Async variant of execute_query; runs it on a worker thread so other coroutines keep going."""
+        return await asyncio.to_thread(self.execute_query, user_query)
+    
+    async def aexecute_many(self, user_queries: List[str]) -> List[QueryResult]:
+        """
+        Execute independent questions concurrently (LLM and database latency overlap).
+        Results are returned in the order of user_queries.
+        """
+        semaphore = asyncio.Semaphore(AEXECUTE_MAX_CONCURRENCY)
+        
+        async def run(user_query: str) -> QueryResult:
+            async with semaphore:
+                return await self.aexecute_query(user_query)
+        
+        return list(await asyncio.gather(*(run(user_query) for user_query in user_queries)))
+    
+    def get_reasoning_explanation_async(self, sql_query: str, user_query: str) -> Future:
+        """Run get_reasoning_explanation on a background thread; call .result() on the Future to wait for it."""
+        return _BACKGROUND_EXECUTOR.submit(self.get_reasoning_explanation, sql_query, user_query)
+    
     def get_reasoning_explanation(self, sql_query: str, user_query: str) -> str:
         """
         Generate detailed reasoning explanation for the SQL query using Claude's Extended Thinking.
@@ -502,22 +1045,14 @@ This is a sample retail/superstore dataset with order information, customer deta
             )
 
             # Collect both thinking and text blocks
-            thinking_content = ""
-            explanation_content = ""
-            
-            for block in response.content:
-                if hasattr(block, 'type'):
-                    if block.type == 'thinking':
-                        # Use correct 'thinking' field for thinking blocks
-                        thinking_text = getattr(block, 'thinking', '')
-                        thinking_content += f"THINKING PROCESS:\n{thinking_text}\n\n"
-                    elif block.type == 'text':
-                        # Use correct 'text' field for text blocks
-                        text_content = getattr(block, 'text', str(block))
-                        explanation_content += text_content
-                else:
-                    # Fallback for older format
-                    explanation_content += str(block)
+            thinking_content = "".join(
+                f"THINKING PROCESS:\n{block.thinking}\n\n"
+                for block in response.content
+                if getattr(block, 'type', None) == 'thinking'
+            )
+            explanation_content = "".join(
+                block.text for block in response.content if getattr(block, 'type', None) == 'text'
+            )
 
             # Combine thinking and explanation
             full_explanation = ""
@@ -529,58 +1064,138 @@ This is a sample retail/superstore dataset with order information, customer deta
             return full_explanation.strip() if full_explanation else "No explanation content found."
 
         except Exception as e:
-            logger.error(f"Error generating extended thinking explanation: {e}")
+            logger.error("Error generating extended thinking explanation: %s", e)
             return f"Explanation unavailable due to error: {str(e)}"
     
+    def _local_syntax_error(self, sql_query: str) -> Optional[str]:
+        """
+        Cheap structural checks (empty statement, more than one statement, unbalanced parentheses or quotes)
+        done before any round trip.
+        Comments, quoted literals/identifiers and dollar-quoted strings are skipped as whole tokens.
+        """
+        if not sql_query.strip():
+            return "Empty SQL statement"
+        depth = 0
+        terminated = False
+        last_end = 0
+        for lexeme in _RE_SQL_LEXEME.finditer(sql_query):
+            token = lexeme.group()
+            # Only comments and further semicolons may follow the statement terminator
+            if terminated and (sql_query[last_end:lexeme.start()].strip() or not (lexeme.group('comment') or token == ';')):
+                return "Multiple SQL statements are not supported"
+            last_end = lexeme.end()
+            if lexeme.group('unterminated'):
+                return f"Unterminated quoted literal, identifier or comment ({token})"
+            if token == '(':
+                depth += 1
+            elif token == ')':
+                depth -= 1
+                if depth < 0:
+                    return "Unbalanced parentheses: unexpected ')'"
+            elif token == ';':
+                terminated = True
+        if terminated and sql_query[last_end:].strip():
+            return "Multiple SQL statements are not supported"
+        if depth:
+            return "Unbalanced parentheses: missing ')'"
+        return None
+    
     def validate_sql_syntax(self, sql_query: str) -> Tuple[bool, str]:
         """Validate SQL syntax without execution using PostgreSQL."""
-        try:
-            import psycopg2
-            conn = psycopg2.connect(**self.database_config)
-            cursor = conn.cursor()
-            cursor.execute(f"EXPLAIN {sql_query}")
-            cursor.close()
-            conn.close()
+        local_error = self._local_syntax_error(sql_query)
+        if local_error:
+            return False, f"Invalid SQL syntax: {local_error}"
+        
+        cache_key = (_config_key(self.database_config), sql_query, hash(self.schema_info))
+        if _VALID_SQL_CACHE.get(cache_key):
             return True, "Valid SQL syntax"
+        
+        try:
+            # Transactional connection: whatever the statement touches is rolled back when it is returned
+            with self._connection() as conn:
+                with conn.cursor() as cursor:
+                    try:
+                        # PREPARE only parses and analyzes the statement; EXPLAIN would also plan it
+                        cursor.execute(f"PREPARE react_validate AS {sql_query}")
+                        error = None
+                    except psycopg2.Error as e:
+                        error = e
+                    # Prepared statements belong to the session, not the transaction; clear them even
+                    # after a failure so the pooled connection can validate again
+                    conn.rollback()
+                    cursor.execute("DEALLOCATE ALL")
         except psycopg2.Error as e:
-            return False, f"Invalid SQL syntax: {str(e)}"
+            error = e
+        if error is not None:
+            return False, f"Invalid SQL syntax: {str(error)}"
+        
+        _VALID_SQL_CACHE.put(cache_key, True)
+        return True, "Valid SQL syntax"
     
-    def get_sample_data(self, table_name: str = None, limit: int = 5) -> pd.DataFrame:
-        """Get sample data from the specified table or list all available tables using PostgreSQL."""
+    def get_sample_data(self, table_name: str = None, limit: int = 5, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Get sample data from the specified table or list all available tables using PostgreSQL.
+        
+        Args:
+            table_name: Public table to sample; when omitted, all tables are listed instead
+            limit: Maximum number of sample rows
+            columns: Only fetch these columns (default: all columns of the table)
+        """
         try:
-            import psycopg2
-            conn = psycopg2.connect(**self.database_config)
-            
-            if table_name:
-                query = f"SELECT * FROM {table_name} LIMIT {limit}"
-                return pd.read_sql_query(query, conn)
-            else:
-                # List all available tables
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT table_name 
-                    FROM information_schema.tables 
-                    WHERE table_schema = 'public'
-                    ORDER BY table_name;
-                """)
-                tables = cursor.fetchall()
-                table_names = [table[0] for table in tables]
-                
-                # Create a DataFrame with table information
-                table_info = []
-                for table in table_names:
-                    try:
-                        cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                        row_count = cursor.fetchone()[0]
-                        table_info.append({"table_name": table, "row_count": row_count})
-                    except:
-                        table_info.append({"table_name": table, "row_count": "Unknown"})
+            with self._connection(autocommit=True) as conn:
+                if table_name:
+                    # Only sample existing public tables/columns; names are quoted as identifiers
+                    with conn.cursor() as cursor:
+                        cursor.execute("""
+                            SELECT a.attname
+                            FROM pg_attribute a
+                            JOIN pg_class c ON c.oid = a.attrelid
+                            JOIN pg_namespace n ON n.oid = c.relnamespace
+                            WHERE n.nspname = 'public' AND c.relname = %s
+                              AND c.relkind IN ('r', 'p', 'v', 'f')
+                              AND a.attnum > 0 AND NOT a.attisdropped
+                            ORDER BY a.attnum;
+                        """, (table_name,))
+                        table_columns = [row[0] for row in cursor.fetchall()]
+                    if not table_columns:
+                        logger.warning("Unknown table requested for sample data: %s", table_name)
+                        return pd.DataFrame()
+                    
+                    if columns:
+                        unknown_columns = set(columns) - set(table_columns)
+                        if unknown_columns:
+                            logger.warning("Ignoring unknown columns for %s: %s", table_name, sorted(unknown_columns))
+                        table_columns = [column for column in columns if column not in unknown_columns]
+                        if not table_columns:
+                            logger.warning("No known columns requested for sample data from %s", table_name)
+                            return pd.DataFrame()
+                    
+                    query = sql.SQL("SELECT {} FROM {} LIMIT %s").format(
+                        sql.SQL(', ').join(map(sql.Identifier, table_columns)),
+                        sql.Identifier(table_name)
+                    )
+                    return self._fetch_dataframe(conn, query, (limit,))
                 
-                cursor.close()
-                conn.close()
-                return pd.DataFrame(table_info)
+                # List all available tables with their planner row estimates (no table scans)
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT c.relname,
+                               CASE WHEN c.relkind IN ('r', 'p') AND c.reltuples >= 0
+                                    THEN c.reltuples::bigint END
+                        FROM pg_class c
+                        JOIN pg_namespace n ON n.oid = c.relnamespace
+                        WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p', 'v', 'f')
+                        ORDER BY c.relname;
+                    """)
+                    rows = cursor.fetchall()
+            
+            # Build the frame column-wise instead of from one dict per table
+            return pd.DataFrame({
+                "table_name": [table for table, _ in rows],
+                "row_count": [row_estimate if row_estimate is not None else "Unknown" for _, row_estimate in rows]
+            })
         except Exception as e:
-            logger.error(f"Error getting sample data: {e}")
+            logger.error("Error getting sample data: %s", e)
             return pd.DataFrame()
 
 # Example usage and testing
@@ -2,7 +2,6 @@ import json
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Any, Union
 from dataclasses import dataclass, asdict
-from anthropic import Anthropic
 import logging
 from datetime import datetime
 import re
@@ -11,11 +10,11 @@ from pathlib import Path
 
 # Docker-compatible imports
 try:
-    from new_data_assistant_project.src.utils.my_config import MyConfig
-    from new_data_assistant_project.src.agents.ReAct_agent import QueryResult, ReActAgent
+    from new_data_assistant_project.src.utils.my_config import MyConfig, get_config
+    from new_data_assistant_project.src.agents.ReAct_agent import QueryResult, ReActAgent, get_anthropic_client
 except ImportError:
-    from src.utils.my_config import MyConfig
-    from src.agents.ReAct_agent import QueryResult, ReActAgent
+    from src.utils.my_config import MyConfig, get_config
+    from src.agents.ReAct_agent import QueryResult, ReActAgent, get_anthropic_client
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -77,11 +76,12 @@ class CLTCFTAgent:
             database_config: PostgreSQL connection configuration dictionary
         """
         try:
-            config = MyConfig()
+            config = get_config()
             api_key = config.get_api_key()
             if not api_key:
                 raise ValueError("No API key found in configuration")
-            self.client = Anthropic(api_key=api_key)
+            # Same shared client (and HTTP connection pool) as the ReAct agent
+            self.client = get_anthropic_client(api_key)
             logger.info("Successfully initialized Anthropic client")
         except Exception as e:
             logger.error(f"Failed to initialize Anthropic client: {e}")
@@ -93,12 +93,13 @@ class CLTCFTAgent:
         
         # Initialize ReAct Agent for SQL query execution with PostgreSQL
         try:
+            # Share the already loaded configuration instead of re-resolving secrets
             if database_config:
-                self.react_agent = ReActAgent(database_config=database_config)
+                self.react_agent = ReActAgent(database_config=database_config, config=config)
             else:
                 # Use default PostgreSQL configuration
                 pg_config = config.get_postgres_config()
-                self.react_agent = ReActAgent(database_config=pg_config)
+                self.react_agent = ReActAgent(database_config=pg_config, config=config)
             logger.info("Successfully initialized ReAct Agent with PostgreSQL")
         except Exception as e:
             logger.error(f"Failed to initialize ReAct Agent: {e}")
@@ -675,7 +675,7 @@ class ExplanationFeedback:
 
     @classmethod
     def get_all_feedback(
-        cls, db_config: Dict[str, Any]
+        cls, db_config: Dict[str, Any], raise_errors: bool = False
     ) -> List["ExplanationFeedback"]:
         try:
             conn = psycopg2.connect(**db_config)
@@ -716,6 +716,8 @@ class ExplanationFeedback:
             return feedback_list
         except Exception as e:
             logger.error(f"Error fetching explanation feedback: {e}")
+            if raise_errors:
+                raise
             return []
 
 
@@ -826,7 +828,7 @@ class ComprehensiveFeedback:
 
     @classmethod
     def get_all_feedback(
-        cls, db_config: Dict[str, Any]
+        cls, db_config: Dict[str, Any], raise_errors: bool = False
     ) -> List["ComprehensiveFeedback"]:
         try:
             conn = psycopg2.connect(**db_config)
@@ -877,6 +879,8 @@ class ComprehensiveFeedback:
             return feedback_list
         except Exception as e:
             logger.error(f"Error fetching comprehensive feedback: {e}")
+            if raise_errors:
+                raise
             return []
 
     @classmethod
@@ -3,6 +3,7 @@ Configuration utilities for the Data Assistant project.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 # Docker-compatible imports
@@ -226,6 +227,11 @@ class MyConfig:
         config = self.postgres_config
         return f"postgresql://{config['user']}:{config['password']}@{config['host']}:{config['port']}/{config['database']}?sslmode={config['sslmode']}"
 
+@lru_cache(maxsize=1)
+def get_config() -> MyConfig:
+    """Get the process-wide configuration so secrets are only resolved once."""
+    return MyConfig()
+
 if __name__ == "__main__":
     try:
         # Initialize configuration